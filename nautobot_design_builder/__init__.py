@@ -26,6 +26,8 @@ class NautobotDesignBuilderConfig(NautobotAppConfig):
     default_settings = {
         "protected_models": [],
         "protected_superuser_bypass": True,
+        "template_bytecode_cache": True,
+        "template_bytecode_cache_dir": None,
     }
     caching_config = {}
 
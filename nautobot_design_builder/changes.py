@@ -11,7 +11,8 @@ if TYPE_CHECKING:
 
 def _get_change_value(value):
     if isinstance(value, django_models.Manager):
-        value = {item.pk for item in value.all()}
+        # Only the primary keys are compared, so don't load the related objects.
+        value = set(value.values_list("pk", flat=True))
     return value
 
 
@@ -27,9 +28,25 @@ def change_log(model_instance: "ModelInstance", attr_name: str):
         model_instance (ModelInstance): The model instance that is being updated.
         attr_name (str): The attribute to be updated.
     """
+    if not model_instance.design_metadata.environment.track_changes:
+        yield
+        return
+
     old_value = _get_change_value(getattr(model_instance.design_instance, attr_name))
     yield
     new_value = _get_change_value(getattr(model_instance.design_instance, attr_name))
+    record_change(model_instance, attr_name, old_value, new_value)
+
+
+def record_change(model_instance: "ModelInstance", attr_name: str, old_value, new_value):
+    """Add a change record to the model instance if a field's value changed.
+
+    Args:
+        model_instance (ModelInstance): The model instance that was updated.
+        attr_name (str): The attribute that was updated.
+        old_value (Any): The value prior to the change. Many-to-many values are sets of primary keys.
+        new_value (Any): The value after the change.
+    """
     if old_value != new_value:
         if isinstance(old_value, set):
             model_instance.design_metadata.changes[attr_name] = {
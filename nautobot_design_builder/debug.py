@@ -46,6 +46,9 @@ def debug(*args, **kwargs):  # noqa:D103  # pylint:disable=missing-function-docs
 
 
 def debug_set(wrapped):  # noqa:D103  # pylint:disable=missing-function-docstring
+    if not DEBUG:
+        return wrapped
+
     def wrapper(self, obj, value, *args, **kwargs):
         obj_details = ObjDetails(obj)
         value_details = ObjDetails(value)
@@ -56,6 +59,4 @@ def debug_set(wrapped):  # noqa:D103  # pylint:disable=missing-function-docstrin
         indent = indent[0:-2]
         debug("Exit", self.__class__.__name__)
 
-    if DEBUG:
-        return wrapper
-    return wrapped
+    return wrapper
@@ -6,7 +6,9 @@ from collections import defaultdict
 from typing import Any, Dict, List, Mapping, Type, Union
 
 from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
 from django.db.models import Model, Manager, QuerySet
+from django.db.models.signals import post_delete, post_save
 from django.db.models.fields import Field as DjangoField
 from django.core.exceptions import ObjectDoesNotExist, ValidationError, MultipleObjectsReturned
 
@@ -16,7 +18,7 @@ from nautobot.extras.models import Relationship
 
 from nautobot_design_builder import errors
 from nautobot_design_builder import ext
-from nautobot_design_builder.fields import CustomRelationshipField, field_factory
+from nautobot_design_builder.fields import CustomRelationshipField, ModelField, field_factory
 from nautobot_design_builder import models
 
 
@@ -514,10 +516,24 @@ def _refresh_custom_relationship(instance: "ModelInstance", relationship: "Relat
 
 
 def _refresh_custom_relationships(instance: "ModelInstance"):
-    """Look for any custom relationships for this model class and add any new fields."""
+    """Look for any custom relationships for this model class and add any new fields.
+
+    The fields are shared by every instance of the model class, so they are only
+    reloaded the first time the class is used in an environment or after a
+    `Relationship` has been saved or deleted (see
+    `Environment.custom_relationships_version`).
+    """
+    model_class = instance.__class__
+    version = instance.design_metadata.environment.custom_relationships_version
+    if model_class.__dict__.get("_custom_relationships_version") == version:
+        return
+
     for direction in Relationship.objects.get_for_model(instance.model_class):
-        for relationship in direction:
+        # The content types on both sides are needed to resolve the related
+        # model and the field's label, so load them with the relationship.
+        for relationship in direction.select_related("source_type", "destination_type"):
             _refresh_custom_relationship(instance, relationship)
+    model_class._custom_relationships_version = version  # pylint:disable=protected-access
 
 
 class ModelInstance:
@@ -664,6 +680,12 @@ _OBJECT_TYPES_APP_FILTER = set(
 )
 
 
+# Field descriptors for each Django model. The descriptors only depend on
+# the Django model fields, so they are built once and shared by the proxy
+# classes of every environment.
+_MODEL_FIELDS: Dict[Type[Model], Dict[str, ModelField]] = {}
+
+
 class Environment:
     """The design builder build environment.
 
@@ -676,6 +698,8 @@ class Environment:
     model_map: Dict[str, Type[Model]]
     model_class_index: Dict[Type, "ModelInstance"]
     deployment: models.Deployment
+    track_changes: bool
+    custom_relationships_version: int
 
     def __init__(
         self,
@@ -683,6 +707,7 @@ class Environment:
         extensions: List[ext.Extension] = None,
         change_set: models.ChangeSet = None,
         import_mode=False,
+        track_changes=True,
     ):
         """Create a new build environment for implementing designs.
 
@@ -699,6 +724,11 @@ class Environment:
 
             import_mode (bool): Whether or not the environment is in import mode. Defaults to False.
 
+            track_changes (bool): Whether or not to record the old and new values of each
+                changed attribute in the model instance's `design_metadata.changes`. The
+                changes are only stored when there is a change set, so this can be turned off
+                for Ad-Hoc designs to skip the extra attribute reads and queries. Defaults to True.
+
         Raises:
             errors.DesignImplementationError: If a provided extension is not a subclass
                 of `ext.Extension`.
@@ -715,8 +745,21 @@ class Environment:
             plural_name = str_to_var_name(model_class._meta.verbose_name_plural)
             self.model_map[plural_name] = self.model_factory(model_class)
             self.model_class_index[model_class] = self.model_map[plural_name]
+        # Content types are looked up while implementing a design (custom relationships,
+        # generic foreign keys, change records). Load them all into Django's content type
+        # cache with one query rather than one query per model on first use.
+        ContentType.objects.get_for_models(*self.model_class_index)
 
         self.import_mode = import_mode
+        self.track_changes = track_changes
+        self.custom_relationships_version = 0
+        # Relationships can be changed by the design itself or through the ORM
+        # (by a context or an extension, for instance). Either way the custom
+        # relationship fields need to be reloaded. Django only keeps a weak
+        # reference to the bound method, so the receivers go away along with
+        # the environment.
+        post_save.connect(self._custom_relationships_changed, sender=Relationship)
+        post_delete.connect(self._custom_relationships_changed, sender=Relationship)
 
         self.extensions = {
             "extensions": [],
@@ -745,6 +788,10 @@ class Environment:
         if change_set:
             self.deployment = change_set.deployment
 
+    def _custom_relationships_changed(self, **kwargs):  # pylint: disable=unused-argument
+        """Signal receiver that invalidates the custom relationship fields of all model classes."""
+        self.custom_relationships_version += 1
+
     def decommission_object(self, object_id, object_name):
         """This method decommissions an specific object_id from the design instance."""
         self.journal.change_set.deployment.decommission(object_id, local_logger=self.logger)
@@ -821,17 +868,22 @@ class Environment:
         Returns:
             type[ModelInstance]: The newly created proxy class.
         """
+        fields = _MODEL_FIELDS.get(django_class)
+        if fields is None:
+            fields = {}
+            field: DjangoField
+            for field in django_class._meta.get_fields():
+                try:
+                    fields[field.name] = field_factory(None, field)
+                except errors.FieldNameError as ex:
+                    self.logger.warning(str(ex))
+            _MODEL_FIELDS[django_class] = fields
+
         cls_attributes = {
             "model_class": django_class,
             "name": django_class.__name__,
+            **fields,
         }
-
-        field: DjangoField
-        for field in django_class._meta.get_fields():
-            try:
-                cls_attributes[field.name] = field_factory(None, field)
-            except errors.FieldNameError as ex:
-                self.logger.warning(str(ex))
         model_class = type(django_class.__name__, (ModelInstance,), cls_attributes)
         return model_class
 
@@ -1,10 +1,11 @@
 """Base Design Job class definition."""
 
 import sys
-import traceback
+import warnings
 from abc import ABC, abstractmethod
+from logging import getLogger
 from os import path
-from typing import Dict
+from typing import Dict, Iterator, Tuple
 import yaml
 
 from django.core.files.base import ContentFile
@@ -12,7 +13,7 @@ from django.contrib.contenttypes.models import ContentType
 from django.db import transaction
 from django.utils import timezone
 
-from jinja2 import TemplateError
+from jinja2 import Environment as TemplateEnvironment, Template, TemplateError
 
 from nautobot.extras.models import Status
 from nautobot.apps.jobs import Job, DryRunVar, StringVar, BooleanVar
@@ -20,12 +21,67 @@ from nautobot.extras.models import FileProxy
 from nautobot.extras.jobs import JobForm
 
 from nautobot_design_builder.errors import DesignImplementationError, DesignModelError
-from nautobot_design_builder.jinja2 import new_template_environment
+from nautobot_design_builder.jinja2 import new_template_environment, root_context_for_render, template_bytecode_cache
 from nautobot_design_builder.design import Environment
 from nautobot_design_builder.context import Context
+from nautobot_design_builder.util import SafeDumper, SafeLoader
 from nautobot_design_builder import models
 from nautobot_design_builder import choices
 
+LOGGER = getLogger(__name__)
+
+
+def _yaml_filename(design_file: str) -> str:
+    """Get the name of the file used to save a rendered design.
+
+    The directory and the last extension (normally `.j2`) are removed
+    from the design template's file name and `.yaml` is added if the
+    remaining name doesn't already end with a YAML extension.
+    """
+    filename, _ = path.splitext(path.basename(design_file))
+    if filename.endswith((".yaml", ".yml")):
+        return filename
+    return f"{filename}.yaml"
+
+
+class _TemplateStream:  # pylint: disable=too-few-public-methods
+    """File-like wrapper around the chunks generated by a Jinja template.
+
+    This allows a rendered template to be consumed by the YAML parser as it
+    is generated, rather than building the entire rendered document first.
+    """
+
+    def __init__(self, chunks: Iterator[str], name: str):
+        """Wrap the `chunks` iterator, usually the result of `Template.generate`."""
+        self._chunks = chunks
+        self.name = name
+        # The chunk currently being read and how much of it has been read. Only
+        # the requested part of a chunk is copied, so a single large chunk is
+        # not re-copied on every read.
+        self._chunk = ""
+        self._offset = 0
+
+    def read(self, size: int = -1) -> str:
+        """Read up to `size` characters from the rendered template."""
+        if size is None or size < 0:
+            data = self._chunk[self._offset :] + "".join(self._chunks)
+            self._chunk, self._offset = "", 0
+            return data
+
+        parts = []
+        while size > 0:
+            if self._offset >= len(self._chunk):
+                chunk = next(self._chunks, None)
+                if chunk is None:
+                    break
+                self._chunk, self._offset = chunk, 0
+                continue
+            part = self._chunk[self._offset : self._offset + size]
+            self._offset += len(part)
+            size -= len(part)
+            parts.append(part)
+        return "".join(parts)
+
 
 class DesignJob(Job, ABC):  # pylint: disable=too-many-instance-attributes
     """The base Design Job class that all specific Design Builder jobs inherit from.
@@ -42,6 +98,27 @@ class DesignJob(Job, ABC):  # pylint: disable=too-many-instance-attributes
     def Meta(cls) -> Job.Meta:  # pylint: disable=invalid-name
         """Design jobs must provide either a Meta class method or a Meta class."""
 
+    def __init_subclass__(cls, **kwargs):
+        """Compile the new design job's templates when the class is defined.
+
+        This moves the template parse and compile cost out of the first
+        job run. Compiling is best-effort: any error (a template error, or
+        an unusable bytecode cache directory) must not stop the job module
+        from being imported, so it is only logged here and is reported
+        when the job is run.
+        """
+        super().__init_subclass__(**kwargs)
+        if "implement_design" in cls.__dict__:
+            warnings.warn(
+                f"{cls.__name__}.implement_design is never called by DesignJob.run, override apply_design instead.",
+                DeprecationWarning,
+                stacklevel=2,
+            )
+        try:
+            cls.compile_templates()
+        except Exception as ex:  # pylint: disable=broad-exception-caught
+            LOGGER.debug("Failed to compile templates for %s: %s", cls.__name__, ex)
+
     def __init__(self, *args, **kwargs):
         """Initialize the design job."""
         # rendered designs
@@ -49,6 +126,7 @@ class DesignJob(Job, ABC):  # pylint: disable=too-many-instance-attributes
         self.designs = {}
         self.rendered_design = None
         self.rendered = None
+        self._active_deployment_status = None
 
         super().__init__(*args, **kwargs)
 
@@ -57,6 +135,11 @@ class DesignJob(Job, ABC):  # pylint: disable=too-many-instance-attributes
         """Determine the implementation mode for the design."""
         return getattr(cls.Meta, "design_mode", choices.DesignModeChoices.CLASSIC)
 
+    @classmethod
+    def save_designs(cls) -> bool:
+        """Determine if the rendered designs should be saved with the job result."""
+        return getattr(cls.Meta, "save_designs", True)
+
     @classmethod
     def is_deployment_job(cls):
         """Determine if a design job has been set to deployment mode."""
@@ -140,6 +223,80 @@ class DesignJob(Job, ABC):  # pylint: disable=too-many-instance-attributes
             environment (Environment): The build environment that consumed the rendered design files. This is useful for accessing the design journal.
         """
 
+    @classmethod
+    def template_search_paths(cls) -> Tuple[str, ...]:
+        """Get the directories that are searched for this design's templates.
+
+        The search paths are computed once per design job class and stored
+        on the class itself, so they are released along with a class that
+        is replaced when Nautobot reloads the job's module.
+
+        Returns:
+            Tuple[str, ...]: The template directories, starting with the design job's own directory.
+        """
+        # Read from the class's own __dict__ so that subclasses never pick
+        # up the search paths cached for one of their parents.
+        search_paths = cls.__dict__.get("_template_search_paths")
+        if search_paths is None:
+            search_paths = []
+            base_cls = cls
+            # We pass a list of directories to the jinja template environment
+            # to be used for search paths in the FileSystemLoader. This list
+            # of paths is compiled from the directory location of the current
+            # design job and its entire inheritance tree. In order to produce
+            # this list, we traverse the inheritance tree upwards until we
+            # get to the toplevel base class, `DesignJob`
+            while base_cls is not DesignJob:
+                class_dir = path.dirname(sys.modules[base_cls.__module__].__file__)
+                search_paths.append(class_dir)
+                base_cls = base_cls.__bases__[0]
+            search_paths = tuple(search_paths)
+            cls._template_search_paths = search_paths
+        return search_paths
+
+    @classmethod
+    def template_environment(cls) -> TemplateEnvironment:
+        """Get the Jinja template environment used to render this design's templates.
+
+        The environment is created once per design job class and stored on
+        the class. It does not carry a render context, the context is supplied
+        for each render by `render`.
+
+        Returns:
+            TemplateEnvironment: The cached template environment for the design job class.
+        """
+        env = cls.__dict__.get("_template_environment")
+        if env is None:
+            env = new_template_environment(
+                base_dir=list(cls.template_search_paths()),
+                bytecode_cache=template_bytecode_cache(),
+            )
+            cls._template_environment = env
+        return env
+
+    @classmethod
+    def compile_templates(cls):
+        """Load and compile the design and report templates named in the design job's Meta.
+
+        The compiled templates are kept in the design job's template environment
+        (and the bytecode cache, if enabled) so that later renders skip the
+        parse and compile step. Since the environment is stored on the design
+        job class, the compiled templates are released along with the class.
+        """
+        meta = cls.Meta
+        filenames = []
+        if hasattr(meta, "design_file"):
+            filenames.append(meta.design_file)
+        filenames.extend(getattr(meta, "design_files", []))
+        if hasattr(meta, "report"):
+            filenames.append(meta.report)
+        if not filenames:
+            return
+
+        env = cls.template_environment()
+        for filename in filenames:
+            env.get_template(filename)
+
     def render(self, context: Context, filename: str) -> str:
         """High level function to render the Jinja design templates into YAML.
 
@@ -153,45 +310,67 @@ class DesignJob(Job, ABC):  # pylint: disable=too-many-instance-attributes
         Returns:
             str: YAML data structure rendered from input Jinja template
         """
-        search_paths = []
-        cls = self.__class__
-        # We pass a list of directories to the jinja template environment
-        # to be used for search paths in the FileSystemLoader. This list
-        # of paths is compiled from the directory location of the current
-        # design job and its entire inheritance tree. In order to produce
-        # this list, we traverse the inheritance tree upwards until we
-        # get to the toplevel base class, `DesignJob`
-        while cls is not DesignJob:
-            class_dir = path.dirname(sys.modules[cls.__module__].__file__)
-            search_paths.append(class_dir)
-            cls = cls.__bases__[0]
-
-        env = new_template_environment(context, search_paths)
+        env = self.template_environment()
 
         try:
-            return env.get_template(filename).render()
+            with root_context_for_render(context):
+                return env.get_template(filename).render()
         except TemplateError as ex:
-            info = sys.exc_info()[2]
-            summary = traceback.extract_tb(info, -1)[0]
-            self.logger.fatal("%s:%d", filename, summary.lineno)
+            self._log_template_error(filename)
             raise ex
 
+    def _log_template_error(self, filename: str):
+        """Log the template line number of the `TemplateError` currently being handled."""
+        # Jinja rewrites the traceback so that the innermost frame
+        # refers to the template line that raised the error.
+        tb = sys.exc_info()[2]
+        while tb.tb_next is not None:
+            tb = tb.tb_next
+        self.logger.fatal("%s:%d", filename, tb.tb_lineno)
+
     def render_design(self, context, design_file):
         """Wrapper function to take in rendered YAML from the design and convert to structured data and assign to the design property of a class instance.
 
+        The template is parsed as it is rendered, so the rendered YAML is only
+        kept (in order to be saved with the job result) if it fails to parse.
+        In that case the template is rendered a second time to capture the
+        text. A template whose output depends on state that changes between
+        renders (for instance a context that counts calls) may produce
+        different text the second time, so the saved file is not guaranteed
+        to be exactly the text that failed to parse.
+
         Args:
             context (Context object): a tree of variables that can include templates for values
             design_file (str): Filename of the design file to render.
         """
-        self.rendered = self.render(context, design_file)
-        design = yaml.safe_load(self.rendered)
-        self.designs[design_file] = design
+        try:
+            template = self.template_environment().get_template(design_file)
+            with root_context_for_render(context):
+                design = yaml.load(_TemplateStream(template.generate(), design_file), Loader=SafeLoader)
+        except TemplateError as ex:
+            self._log_template_error(design_file)
+            raise ex
+        except yaml.YAMLError as ex:
+            self.rendered_design = design_file
+            self.rendered = self.render(context, design_file)
+            raise ex
 
-        # no need to save the rendered content if yaml loaded
-        # it okay
-        self.rendered = None
+        if self.save_designs():
+            self.designs[design_file] = design
         return design
 
+    @classmethod
+    def report_template(cls) -> Template:
+        """Get the compiled report template for this design job.
+
+        The template comes from the design job's cached template environment,
+        so it is only parsed and compiled once (or when the file changes).
+
+        Returns:
+            Template: The template named by the job's `Meta.report`.
+        """
+        return cls.template_environment().get_template(getattr(cls.Meta, "report"))
+
     def render_report(self, context: Context, journal: Dict) -> str:
         """Wrapper function to create rendered markdown report from the design job's Jinja report template.
 
@@ -202,118 +381,143 @@ class DesignJob(Job, ABC):  # pylint: disable=too-many-instance-attributes
         Returns:
             str: job report data in markdown format
         """
-        return self.render(
-            {
-                "context": context,
-                "journal": journal,
-            },
-            getattr(self.Meta, "report"),
-        )
+        try:
+            return self.report_template().render(context=context, journal=journal)
+        except TemplateError as ex:
+            self._log_template_error(getattr(self.Meta, "report"))
+            raise ex
 
     def implement_design(self, context, design_file, commit):
-        """Render the design_file template using the provided render context."""
+        """Render the design_file template using the provided render context.
+
+        Deprecated: `run` renders every design file before implementing any of
+        them, so this method is no longer called. Use `render_design` followed
+        by `apply_design`, and override `apply_design` to customize how each
+        rendered design is implemented.
+        """
+        warnings.warn(
+            "DesignJob.implement_design is deprecated, use render_design and apply_design instead.",
+            DeprecationWarning,
+            stacklevel=2,
+        )
         design = self.render_design(context, design_file)
+        self.apply_design(design, commit)
+
+    def apply_design(self, design, commit):
+        """Implement an already rendered design in the job's build Environment.
+
+        This is called by `run` once for each design file, in order, after all
+        of the design files have been rendered. Design jobs can override it to
+        customize how each design is implemented.
+        """
         self.environment.implement_design(design, commit)
 
+    def active_deployment_status(self) -> Status:
+        """Get the active status for deployments.
+
+        The status is only looked up once per job run.
+        """
+        if self._active_deployment_status is None:
+            self._active_deployment_status = Status.objects.get(
+                content_types=ContentType.objects.get_for_model(models.Deployment),
+                name=choices.DeploymentStatusChoices.ACTIVE,
+            )
+        return self._active_deployment_status
+
     def _setup_changeset(self, deployment_name: str):
         if not self.is_deployment_job():
             return None, None
 
+        design = self.design_model()
         try:
-            instance = models.Deployment.objects.get(name=deployment_name, design=self.design_model())
+            instance = models.Deployment.objects.get(name=deployment_name, design=design)
             self.logger.info('Existing design instance of "%s" was found, re-running design job.', deployment_name)
             instance.last_implemented = timezone.now()
+            # Only the implementation time has changed, so there is nothing
+            # that needs to be validated again.
+            instance.save(update_fields=["last_implemented", "last_updated"])
         except models.Deployment.DoesNotExist:
             self.logger.info('Implementing new design "%s".', deployment_name)
-            content_type = ContentType.objects.get_for_model(models.Deployment)
             instance = models.Deployment(
                 name=deployment_name,
-                design=self.design_model(),
+                design=design,
                 last_implemented=timezone.now(),
-                status=Status.objects.get(content_types=content_type, name=choices.DeploymentStatusChoices.ACTIVE),
-                version=self.design_model().version,
+                status=self.active_deployment_status(),
+                version=design.version,
             )
-        instance.validated_save()
-        change_set, created = models.ChangeSet.objects.get_or_create(
-            deployment=instance,
-            job_result=self.job_result,
-        )
-        if created:
+            instance.validated_save()
+
+        change_set = models.ChangeSet.objects.filter(deployment=instance, job_result=self.job_result).first()
+        if change_set is None:
+            change_set = models.ChangeSet(deployment=instance, job_result=self.job_result)
             change_set.validated_save()
 
         previous_change_set = instance.change_sets.order_by("-last_updated").exclude(job_result=self.job_result).first()
         return (change_set, previous_change_set)
 
     def run(self, dryrun: bool = False, **kwargs):  # pylint: disable=arguments-differ
-        """Render the design and implement it within a build Environment object."""
+        """Render the design and implement it within a build Environment object.
+
+        The design templates are rendered before the database transaction is
+        opened so that the transaction is only held while the design is
+        implemented.
+        """
         try:
-            return self._run_in_transaction(dryrun, **kwargs)
+            meta = self.Meta
+            self.logger.info("Building %s", getattr(meta, "name"))
+
+            kwargs["import_mode"] = self.is_deployment_job() and kwargs.get("import_mode", False)
+            kwargs["deployment_name"] = self.determine_deployment_name(kwargs)
+            self.job_result.job_kwargs = {"data": self.serialize_data(kwargs)}
+
+            context_class = getattr(meta, "context_class", None)
+            if context_class:
+                context = context_class(data=kwargs, job_result=self.job_result)
+                context.validate()
+            else:
+                context = {}
+
+            design_file = getattr(meta, "design_file", None)
+            design_files = [design_file] if design_file else getattr(meta, "design_files", None)
+            if design_files is None:
+                self.logger.fatal("No design template specified for design.")
+                raise DesignImplementationError("No design template specified for design.")
+
+            designs = [self.render_design(context, filename) for filename in design_files]
+            return self._run_in_transaction(dryrun, context, designs, **kwargs)
         finally:
+            files = {}
             if self.rendered:
-                rendered_design = path.basename(self.rendered_design)
-                rendered_design, _ = path.splitext(rendered_design)
-                if not rendered_design.endswith(".yaml") and not rendered_design.endswith(".yml"):
-                    rendered_design = f"{rendered_design}.yaml"
-                self.save_design_file(rendered_design, self.rendered)
+                files[_yaml_filename(self.rendered_design)] = self.rendered
             for design_file, design in self.designs.items():
-                output_file = path.basename(design_file)
-                # this should remove the .j2
-                output_file, _ = path.splitext(output_file)
-                if not output_file.endswith(".yaml") and not output_file.endswith(".yml"):
-                    output_file = f"{output_file}.yaml"
-                self.save_design_file(output_file, yaml.safe_dump(design))
+                files[_yaml_filename(design_file)] = yaml.dump(design, Dumper=SafeDumper, encoding="utf-8")
+            if files:
+                self.save_design_files(files)
 
     @transaction.atomic
-    def _run_in_transaction(self, dryrun: bool, **data):  # pylint: disable=too-many-branches
-        """Render the design and implement it within a build Environment object.
+    def _run_in_transaction(self, dryrun: bool, context, designs, **data):
+        """Implement the rendered designs within a build Environment object.
 
         This version of `run` is wrapped in a transaction and will roll back database changes
         on error. In general, this method should only be called by the `run` method.
         """
-        sid = transaction.savepoint()
-
-        self.logger.info("Building %s", getattr(self.Meta, "name"))
-        extensions = getattr(self.Meta, "extensions", [])
-
-        design_files = None
-
-        data["import_mode"] = self.is_deployment_job() and data.get("import_mode", False)
-        data["deployment_name"] = self.determine_deployment_name(data)
+        meta = self.Meta
         change_set, previous_change_set = self._setup_changeset(data["deployment_name"])
 
-        self.job_result.job_kwargs = {"data": self.serialize_data(data)}
-
-        self.logger.info("Building %s", getattr(self.Meta, "name"))
-        extensions = getattr(self.Meta, "extensions", [])
         self.environment = Environment(
             logger=self.logger,
-            extensions=extensions,
+            extensions=getattr(meta, "extensions", []),
             change_set=change_set,
             import_mode=data["import_mode"],
+            track_changes=change_set is not None,
         )
 
         if data["import_mode"]:
             self.logger.info("Running in import mode for %s", data["deployment_name"])
 
-        design_files = None
-
-        if hasattr(self.Meta, "context_class"):
-            context = self.Meta.context_class(data=data, job_result=self.job_result)
-            context.validate()
-        else:
-            context = {}
-
-        if hasattr(self.Meta, "design_file"):
-            design_files = [self.Meta.design_file]
-        elif hasattr(self.Meta, "design_files"):
-            design_files = self.Meta.design_files
-        else:
-            self.logger.fatal("No design template specified for design.")
-            raise DesignImplementationError("No design template specified for design.")
-
         try:
-            for design_file in design_files:
-                self.implement_design(context, design_file, not dryrun)
+            for design in designs:
+                self.apply_design(design, not dryrun)
 
             if previous_change_set:
                 deleted_object_ids = previous_change_set - change_set
@@ -328,31 +532,28 @@ class DesignJob(Job, ABC):  # pylint: disable=too-many-instance-attributes
                 # The ChangeSet stores the design (with Nautobot identifiers from post_implementation)
                 # for future operations (e.g., updates)
                 if self.is_deployment_job():
-                    change_set.deployment.status = Status.objects.get(
-                        content_types=ContentType.objects.get_for_model(models.Deployment),
-                        name=choices.DeploymentStatusChoices.ACTIVE,
-                    )
-                    change_set.deployment.save()
-                    change_set.save()
+                    change_set.deployment.status = self.active_deployment_status()
+                    change_set.deployment.save(update_fields=["status", "last_updated"])
+                    change_set.save(update_fields=["last_updated"])
 
-                if hasattr(self.Meta, "report"):
+                report_file = getattr(meta, "report", None)
+                if report_file:
                     report = self.render_report(context, self.environment.journal)
-                    output_filename: str = path.basename(getattr(self.Meta, "report"))
+                    output_filename: str = path.basename(report_file)
                     if output_filename.endswith(".j2"):
                         output_filename = output_filename[0:-3]
                     self.logger.info(report)
                     self.save_design_file(output_filename, report)
             else:
-                transaction.savepoint_rollback(sid)
                 self.logger.info("%s can be imported successfully - No database changes made", self.name)
+                # Roll back the transaction when the atomic block exits, without
+                # needing a savepoint of our own. No queries can be made on this
+                # connection after this point.
+                transaction.set_rollback(True)
         except (DesignImplementationError, DesignModelError) as ex:
-            transaction.savepoint_rollback(sid)
             self.logger.fatal("Failed to implement design")
             self.logger.fatal(str(ex))
             raise ex
-        except Exception as ex:
-            transaction.savepoint_rollback(sid)
-            raise ex
 
     def save_design_file(self, filename, content):
         """Save some content to a job file.
@@ -361,10 +562,27 @@ class DesignJob(Job, ABC):  # pylint: disable=too-many-instance-attributes
 
         Args:
             filename (str): The name of the file to save.
-            content (str): The content to save to the file.
+            content (str | bytes): The content to save to the file. Strings are
+                saved UTF-8 encoded.
         """
-        FileProxy.objects.create(
-            name=filename,
-            job_result=self.job_result,
-            file=ContentFile(content.encode("utf-8"), name=filename),
-        )
+        self.save_design_files({filename: content})
+
+    def save_design_files(self, files: Dict[str, "str | bytes"]):
+        """Save several job files with a single database query.
+
+        Args:
+            files (Dict[str, str | bytes]): Mapping of file names to the content
+                to save in each file. Strings are saved UTF-8 encoded.
+        """
+        proxies = []
+        for filename, content in files.items():
+            if isinstance(content, str):
+                content = content.encode("utf-8")
+            proxies.append(
+                FileProxy(
+                    name=filename,
+                    job_result=self.job_result,
+                    file=ContentFile(content, name=filename),
+                )
+            )
+        FileProxy.objects.bulk_create(proxies)
@@ -1,6 +1,5 @@
 """Module containing error Exception classes specific to Design Builder."""
 
-from collections import defaultdict
 from inspect import isclass
 
 from django.core.exceptions import ValidationError
@@ -8,15 +7,23 @@ from django.db.models import Model
 
 
 def _error_msg(validation_error):
-    errors = defaultdict(list)
     try:
-        for attribute, messages in validation_error.message_dict.items():
-            for message in messages:
-                errors[attribute].append(message)
+        return {attribute: list(messages) for attribute, messages in validation_error.message_dict.items()}
     except AttributeError:
-        errors["__all__"] = [*validation_error.messages]
+        return {"__all__": list(validation_error.messages)}
 
-    return errors
+
+def _safe_str(obj, default: str) -> str:
+    """Convert `obj` to a string, returning `default` if that fails."""
+    try:
+        return str(obj)
+    except Exception:  # pylint: disable=broad-exception-caught
+        # Sometimes when converting a model to a string the __str__
+        # method itself produces an exceptions, like when an attribute
+        # hasn't been set or something. Whatever it is commonly is
+        # the cause of the original exception, we don't want to
+        # cause *another* exception because of that.
+        return default
 
 
 class DesignImplementationError(Exception):
@@ -52,19 +59,10 @@ class DesignModelError(Exception):
 
     @staticmethod
     def _model_str(model):
-        instance_str = None
         if not isinstance(model, Model) and not hasattr(model, "design_instance"):
             if isclass(model):
                 return model.__name__
-            try:
-                return str(model)
-            except Exception:  # pylint: disable=broad-exception-caught
-                # Sometimes when converting a model to a string the __str__
-                # method itself produces an exceptions, like when an attribute
-                # hasn't been set or something. Whatever it is commonly is
-                # the cause of the original exception, we don't want to
-                # cause *another* exception because of that.
-                return model.__class__.__name__
+            return _safe_str(model, model.__class__.__name__)
 
         model_class = model.__class__
         # if it looks like a duck...
@@ -72,17 +70,8 @@ class DesignModelError(Exception):
             model_class = model.model_class
             model = model.design_instance
 
-        if model:
-            try:
-                instance_str = str(model)
-            except Exception:  # pylint: disable=broad-exception-caught
-                # Sometimes when converting a model to a string the __str__
-                # method itself produces an exceptions, like when an attribute
-                # hasn't been set or something. Whatever it is commonly is
-                # the cause of the original exception, we don't want to
-                # cause *another* exception because of that.
-                instance_str = "unknown"
         model_str = model_class._meta.verbose_name.capitalize()
+        instance_str = _safe_str(model, "unknown") if model else None
         if instance_str:
             model_str = f"{model_str} {instance_str}"
         return model_str
@@ -90,16 +79,23 @@ class DesignModelError(Exception):
     @staticmethod
     def _object_to_markdown(obj, indentation=""):
         msg = []
+        DesignModelError._append_markdown(msg, obj, indentation)
+        return "\n".join(msg)
+
+    @staticmethod
+    def _append_markdown(msg, obj, indentation):
+        # Nested dictionaries append their lines to the same list so that
+        # the message is only joined once, rather than once per level.
         if isinstance(obj, dict):
+            child_indentation = f"{indentation}    "
             for key, value in obj.items():
-                msg.append(f"{indentation}- **{key}:** ")
                 if isinstance(value, dict):
-                    msg.append(DesignModelError._object_to_markdown(value, indentation=f"{indentation}    "))
+                    msg.append(f"{indentation}- **{key}:** ")
+                    DesignModelError._append_markdown(msg, value, child_indentation)
                 else:
-                    msg[-1] += DesignModelError._model_str(value)
+                    msg.append(f"{indentation}- **{key}:** {DesignModelError._model_str(value)}")
         else:
             msg.append(f"{indentation}- {DesignModelError._model_str(obj)}")
-        return "\n".join(msg)
 
     @property
     def model_str(self):
@@ -155,15 +151,10 @@ class DesignValidationError(DesignModelError):
         msg.append(f"{indentation}{self.model_str} failed validation")
         if isinstance(self.__cause__, ValidationError):
             fields = _error_msg(self.__cause__)
-            keys = list(fields.keys())
-            keys.sort()
             for message in fields.pop("__all__", []):
                 msg.append(f"{indentation}  {message}")
 
-            for key in keys:
-                if key == "__all__":
-                    continue
-
+            for key in sorted(fields):
                 field_msg = "\n".join(fields[key])
                 msg.append(f"{indentation}  **{key}:** {field_msg}")
         return "\n\n".join(msg)
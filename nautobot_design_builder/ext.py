@@ -2,8 +2,8 @@
 
 import os
 from abc import ABC, abstractmethod
-from functools import reduce
-from typing import TYPE_CHECKING, Any, List
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, List, Tuple, Type
 
 import inspect
 import sys
@@ -13,6 +13,7 @@ import yaml
 from nautobot_design_builder import NautobotDesignBuilderConfig
 from nautobot_design_builder.errors import DesignImplementationError
 from nautobot_design_builder.git import GitRepo
+from nautobot_design_builder.util import Dumper
 
 if TYPE_CHECKING:
     from design import ModelInstance, Environment
@@ -28,12 +29,19 @@ def extensions(module: ModuleType = None) -> List["Extension"]:
 
     Args:
         module (ModuleType): Module to search for extensions. If left as `None` then the ext.py module is searched.
+            Each module is only searched the first time it is requested.
 
     Returns:
         List[Extension]: List of extensions found in the module.
     """
     if module is None:
         module = sys.modules[__name__]
+    return list(_module_extensions(module))
+
+
+@lru_cache(maxsize=None)
+def _module_extensions(module: ModuleType) -> Tuple[Type["Extension"], ...]:
+    """Scan a module for extensions, only once per module."""
 
     def matches(value):
         if hasattr(value, "__module__"):
@@ -41,7 +49,7 @@ def extensions(module: ModuleType = None) -> List["Extension"]:
                 return is_extension(value)
         return False
 
-    return [extension[1] for extension in inspect.getmembers(module, matches)]
+    return tuple(extension[1] for extension in inspect.getmembers(module, matches))
 
 
 class Extension(ABC):
@@ -136,6 +144,13 @@ class ValueExtension(Extension, ABC):
         """
 
 
+@lru_cache(maxsize=1024)
+def _parse_ref_key(key: str) -> Tuple[str, Tuple[str, ...]]:
+    """Split a reference such as `device.platform.name` into its name and attribute path."""
+    key, *attributes = key.split(".")
+    return key, tuple(attributes)
+
+
 class ReferenceExtension(AttributeExtension, ValueExtension):
     """An ObjectCreator extension the creates references to objects and retrieves them.
 
@@ -199,10 +214,7 @@ class ReferenceExtension(AttributeExtension, ValueExtension):
         Returns:
             CreatorObject: The object stored at `reference_name`
         """
-        keys = key.split(".", 1)
-        attribute = None
-        if len(keys) == 2:
-            key, attribute = keys
+        key, attributes = _parse_ref_key(key)
         try:
             model_instance = self._env[key]
         except KeyError:
@@ -211,13 +223,19 @@ class ReferenceExtension(AttributeExtension, ValueExtension):
         adding = model_instance.design_instance._state.adding  # pylint: disable=protected-access
         if model_instance.design_instance and not adding:
             model_instance.design_instance.refresh_from_db()
-        if attribute:
-            # TODO: I think the result of the reduce operation needs to (potentially)
+        if attributes:
+            # TODO: I think the result of the attribute lookup needs to (potentially)
             # be wrapped up in a ModelInstance object
-            return reduce(getattr, [model_instance.design_instance, *attribute.split(".")])
+            value = model_instance.design_instance
+            for attribute in attributes:
+                value = getattr(value, attribute)
+            return value
         return model_instance
 
 
+_GIT_CONTEXT_REQUIRED_FIELDS = frozenset(("destination", "data"))
+
+
 class GitContextExtension(AttributeExtension):
     """Provides the "!git_context" attribute extension that will save content to a git repo.
 
@@ -245,17 +263,27 @@ class GitContextExtension(AttributeExtension):
 
     def __init__(self, environment: "Environment"):  # noqa: D107
         super().__init__(environment)
-        slug = NautobotDesignBuilderConfig.context_repository
-        self.context_repo = GitRepo(slug, environment.job_result)
-        self._env = {}
+        self._context_repo = None
         self._reset()
 
+    @property
+    def context_repo(self) -> GitRepo:
+        """The git repository that config contexts are written to.
+
+        The repository is only opened the first time it is needed.
+        """
+        if self._context_repo is None:
+            slug = NautobotDesignBuilderConfig.context_repository
+            self._context_repo = GitRepo(slug, self.environment.job_result)
+        return self._context_repo
+
     def _reset(self):
         """Reset the internal state for commit/rollback tracking."""
         self._env = {
-            "files": [],
+            "files": set(),
             "directories": [],
         }
+        self._seen_dirs = set()
 
     def attribute(self, *args, value=None, model_instance: "ModelInstance" = None):
         """Provide the attribute tag functionality for git_context.
@@ -273,40 +301,56 @@ class GitContextExtension(AttributeExtension):
         Raises:
             DesignImplementationError: raised if a required field is missing from the attribute's dictionary.
         """
-        required_fields = set("destination", "data")
-        missing_fields = required_fields - set(value.keys())
+        missing_fields = _GIT_CONTEXT_REQUIRED_FIELDS.difference(value)
         if missing_fields:
-            missing_fields = ", ".join(missing_fields)
+            missing_fields = ", ".join(sorted(missing_fields))
             raise DesignImplementationError(f"git-context is missing {missing_fields}")
 
         base_dir = self.context_repo.path
-        output_dir = os.path.join(base_dir, os.path.dirname(value["destination"]))
-        try:
-            os.makedirs(output_dir)
-            self._env["directories"].append(output_dir)
-        except FileExistsError:
-            # this just means the directory exists
-            # prior to this particular change, so don't
-            # record that the directory was created so we
-            # don't accidentally remove it during roll back
-            pass
-
-        output_file = os.path.join(base_dir, value["destination"])
-        with open(output_file, "w", encoding="UTF-8") as context_file:
-            yaml.dump(value["data"], context_file)
-        self._env["files"].append(output_file)
+        output_file = os.path.normpath(os.path.join(base_dir, value["destination"]))
+        output_dir = os.path.dirname(output_file)
+        if output_dir not in self._seen_dirs:
+            self._seen_dirs.add(output_dir)
+            # Only record directories that didn't exist prior to this
+            # particular change so that we don't accidentally remove
+            # them during roll back
+            missing_dirs = []
+            dirpath = output_dir
+            while not os.path.isdir(dirpath):
+                missing_dirs.append(dirpath)
+                dirpath = os.path.dirname(dirpath)
+            if missing_dirs:
+                os.makedirs(output_dir)
+                self._env["directories"].extend(missing_dirs)
+
+        with open(output_file, "wb") as context_file:
+            # The context data is not limited to plain YAML types, so the full
+            # (not the safe) dumper is used, as it always has been.
+            yaml.dump(value["data"], context_file, Dumper=Dumper, encoding="utf-8")
+        self._env["files"].add(output_file)
 
     def commit(self):
         """Commit the added files to the git repository and push the changes."""
+        if not self._env["files"]:
+            # Nothing was written since the last commit, so there is
+            # nothing to commit or push.
+            return
         self.context_repo.commit_with_added("Created by design builder")
         self.context_repo.push()
         self._reset()
 
     def roll_back(self):
-        """Delete any files and directories that were created by the tag."""
+        """Delete any files and directories that were created by the tag.
+
+        Only the files written by the tag and the directories that it created
+        are removed. A created directory that still holds anything else is
+        left in place.
+        """
         for file in self._env["files"]:
             os.remove(file)
 
-        for dirpath in self._env["directories"]:
-            os.rmdir(dirpath)
+        # Remove the deepest directories first so that their parents are empty.
+        for dirpath in sorted(self._env["directories"], reverse=True):
+            if not os.listdir(dirpath):
+                os.rmdir(dirpath)
         self._reset()
@@ -40,7 +40,7 @@ See also: https://docs.python.org/3/howto/descriptor.html
 
 from abc import ABC, abstractmethod
 from logging import getLogger
-from typing import Any, Mapping, Type, TYPE_CHECKING
+from typing import Any, Dict, Mapping, Type, TYPE_CHECKING
 
 from django.db import models as django_models
 from django.contrib.contenttypes.models import ContentType
@@ -51,7 +51,7 @@ from taggit.managers import TaggableManager
 from nautobot.core.graphql.utils import str_to_var_name
 from nautobot.extras.models import Relationship, RelationshipAssociation
 
-from nautobot_design_builder.changes import change_log
+from nautobot_design_builder.changes import change_log, record_change
 from nautobot_design_builder.errors import DesignImplementationError, FieldNameError
 from nautobot_design_builder.debug import debug_set
 
@@ -72,9 +72,6 @@ class ModelField(ABC):
 
     field_name: str
 
-    def __set_name__(self, owner, name):  # noqa: D105
-        self.field_name = name
-
     def __get__(self, obj, objtype=None) -> Any:
         """Retrieve the field value.
 
@@ -88,9 +85,12 @@ class ModelField(ABC):
         Returns:
             Any: Either the descriptor instance or the field value.
         """
-        if obj is None or obj.design_instance is None:
+        if obj is None:
+            return self
+        design_instance = obj.design_instance
+        if design_instance is None:
             return self
-        return getattr(obj.design_instance, self.field_name)
+        return getattr(design_instance, self.field_name)
 
     @abstractmethod
     def __set__(self, obj: "ModelInstance", value):
@@ -137,8 +137,17 @@ class SimpleField(BaseModelField):  # pylint:disable=too-few-public-methods
 
     @debug_set
     def __set__(self, obj: "ModelInstance", value):  # noqa: D105
-        with change_log(obj, self.field_name):
-            setattr(obj.design_instance, self.field_name, value)
+        # Every scalar attribute in a design is assigned here, so record the
+        # change directly rather than through the `change_log` context manager.
+        # Scalar values never need converting the way related managers do.
+        design_instance = obj.design_instance
+        field_name = self.field_name
+        if not obj.design_metadata.environment.track_changes:
+            setattr(design_instance, field_name, value)
+            return
+        old_value = getattr(design_instance, field_name)
+        setattr(design_instance, field_name, value)
+        record_change(obj, field_name, old_value, getattr(design_instance, field_name))
 
 
 class RelationshipFieldMixin:  # pylint:disable=too-few-public-methods
@@ -178,7 +187,9 @@ class RelationshipFieldMixin:  # pylint:disable=too-few-public-methods
         """
         if related_model is None:
             related_model = self.related_model
-        if isinstance(value, Mapping):
+        # Designs are loaded from YAML, so mappings are almost always plain
+        # dicts and the ABC isinstance check can usually be skipped.
+        if type(value) is dict or isinstance(value, Mapping):  # pylint:disable=unidiomatic-typecheck
             value = obj.design_metadata.create_child(related_model, value, relationship_manager)
         return value
 
@@ -210,16 +221,23 @@ class ForeignKeyField(BaseModelField, RelationshipFieldMixin):  # pylint:disable
 class ManyToOneRelField(BaseModelField, RelationshipFieldMixin):  # pylint:disable=too-few-public-methods
     """The reverse side of a `ForeignKey` relationship."""
 
+    def __init__(self, field: django_models.Field):  # noqa:D102,D107
+        super().__init__(field)
+        # The children's foreign key back to the parent model.
+        self.fk_name = field.field.name
+        self.fk_attname = field.field.attname
+
     @debug_set
     def __set__(self, obj: "ModelInstance", values):  # noqa:D105
         if not isinstance(values, list):
             raise DesignImplementationError("Many-to-one fields must be a list", obj)
 
         def setter():
+            manager = getattr(obj.design_instance, self.field_name)
             for value in values:
-                value = self._get_instance(obj, value, getattr(obj, self.field_name))
-                with change_log(value, self.field.field.attname):
-                    setattr(value.design_instance, self.field.field.name, obj.design_instance)
+                value = self._get_instance(obj, value, manager)
+                with change_log(value, self.fk_attname):
+                    setattr(value.design_instance, self.fk_name, obj.design_instance)
                 value.save()
 
         obj.connect("POST_INSTANCE_SAVE", setter)
@@ -237,6 +255,7 @@ class ManyToManyField(BaseModelField, RelationshipFieldMixin):  # pylint:disable
         self.through = self.field.remote_field.through
         if not self.through._meta.auto_created:
             self.auto_through = False
+            self.through_field_names = frozenset(field.name for field in self.through._meta.fields)
             if self.field.remote_field.through_fields:
                 self.link_field = self.field.remote_field.through_fields[0]
             else:
@@ -257,7 +276,8 @@ class ManyToManyField(BaseModelField, RelationshipFieldMixin):  # pylint:disable
         is by examining the values to be assigned and matching their keys with
         the related model and through model.
         """
-        if isinstance(value, Mapping):
+        # Implicit through tables can only be assigned through the related model.
+        if self.auto_through is False and isinstance(value, Mapping):
             attributes = set()
             # Extract all of the top-level field names from the query in order
             # to match them against available fields in the through table. If
@@ -265,25 +285,24 @@ class ManyToManyField(BaseModelField, RelationshipFieldMixin):  # pylint:disable
             # then use the through class directly, otherwise use the related_model
             # class
             for attribute in value.keys():
-                if attribute.startswith("!get") or attribute.startswith("!create"):
-                    attribute_parts = attribute.split(":")
-                    attribute = attribute_parts[1]
-
-                if "__" in attribute:
-                    attribute = attribute.split("__")[0]
-                attributes.add(attribute)
-            through_fields = set(field.name for field in self.through._meta.fields)
-            if self.auto_through is False and attributes.issubset(through_fields):
-                return self.through, attributes.intersection(through_fields)
+                if attribute.startswith(("!get", "!create")):
+                    attribute = attribute.split(":")[1]
+
+                attributes.add(attribute.partition("__")[0])
+            if attributes.issubset(self.through_field_names):
+                return self.through, attributes
         return self.related_model, set()
 
     @debug_set
     def __set__(self, obj: "ModelInstance", values):  # noqa:D105
         def setter():
             items = []
+            # Django builds a new related manager on every attribute access,
+            # so only get it once.
+            manager = getattr(obj.design_instance, self.field_name)
             for value in values:
                 related_model, through_fields = self._get_related_model(value)
-                relationship_manager = getattr(obj.design_instance, self.field_name).model.objects
+                relationship_manager = manager.model.objects
                 if through_fields:
                     value[f"!create_or_update:{self.link_field}_id"] = str(obj.design_instance.id)
                     relationship_manager = self.through.objects
@@ -299,7 +318,7 @@ class ManyToManyField(BaseModelField, RelationshipFieldMixin):  # pylint:disable
                     value.save()
             if items:
                 with change_log(obj, self.field_name):
-                    getattr(obj.design_instance, self.field_name).add(*items)
+                    manager.add(*items)
 
         obj.connect("POST_INSTANCE_SAVE", setter)
 
@@ -311,6 +330,7 @@ class ManyToManyRelField(ManyToManyField):  # pylint:disable=too-few-public-meth
         self.through = self.field.through
         if not self.through._meta.auto_created:
             self.auto_through = False
+            self.through_field_names = frozenset(field.name for field in self.through._meta.fields)
             if self.field.through_fields:
                 self.link_field = self.field.through_fields[0]
             else:
@@ -339,14 +359,28 @@ class GenericRelationField(BaseModelField, RelationshipFieldMixin):  # pylint:di
 class GenericForeignKeyField(BaseModelField, RelationshipFieldMixin):  # pylint:disable=too-few-public-methods
     """Generic foreign key field."""
 
+    def __init__(self, field: django_models.Field):  # noqa:D102,D107
+        super().__init__(field)
+        self.fk_field = field.fk_field
+        self.ct_field = field.ct_field
+        self.ct_id_field = field.model._meta.get_field(field.ct_field).attname
+
     @debug_set
     def __set__(self, obj: "ModelInstance", value):  # noqa:D105
-        fk_field = self.field.fk_field
-        ct_field = self.field.ct_field
-        ct_id_field = obj.design_instance._meta.get_field(ct_field).attname
-        with change_log(obj, fk_field), change_log(obj, ct_id_field):
-            setattr(obj.design_instance, fk_field, value.design_instance.pk)
-            setattr(obj.design_instance, ct_field, ContentType.objects.get_for_model(value.design_instance))
+        design_instance = obj.design_instance
+        related = value.design_instance
+        if not obj.design_metadata.environment.track_changes:
+            setattr(design_instance, self.fk_field, related.pk)
+            setattr(design_instance, self.ct_field, ContentType.objects.get_for_model(related))
+            return
+        # Both the object id and the content type id are scalars, so they are
+        # snapshotted together rather than through two nested change logs.
+        old_fk = getattr(design_instance, self.fk_field)
+        old_ct_id = getattr(design_instance, self.ct_id_field)
+        setattr(design_instance, self.fk_field, related.pk)
+        setattr(design_instance, self.ct_field, ContentType.objects.get_for_model(related))
+        record_change(obj, self.fk_field, old_fk, getattr(design_instance, self.fk_field))
+        record_change(obj, self.ct_id_field, old_ct_id, getattr(design_instance, self.ct_id_field))
 
 
 class TagField(BaseModelField, RelationshipFieldMixin):  # pylint:disable=too-few-public-methods
@@ -362,14 +396,15 @@ class TagField(BaseModelField, RelationshipFieldMixin):  # pylint:disable=too-fe
         # moment.
         def setter():
             items = []
+            manager = getattr(obj.design_instance, self.field_name)
             for value in values:
-                value = self._get_instance(obj, value, getattr(obj.design_instance, self.field_name))
+                value = self._get_instance(obj, value, manager)
                 if value.design_metadata.created:
                     value.save()
                 items.append(value.design_instance)
             if items:
                 with change_log(obj, self.field_name):
-                    getattr(obj.design_instance, self.field_name).add(*items)
+                    manager.add(*items)
 
         obj.connect("POST_INSTANCE_SAVE", setter)
 
@@ -416,8 +451,13 @@ class CustomRelationshipField(ModelField, RelationshipFieldMixin):  # pylint: di
             field_name = str(self.relationship.get_label("destination")).lower()
         if hasattr(model_class.model_class, field_name):
             raise FieldNameError(model_class, relationship, field_name)
-        self.__set_name__(model_class, str_to_var_name(field_name))
+        self.field_name = str_to_var_name(field_name)
         self.key_name = self.relationship.key
+        # Values assigned to this field are instances of the related model, so
+        # whether they are the source side of the relationship never changes.
+        self.value_is_source = self.related_model is not None and self.relationship.source_type == (
+            ContentType.objects.get_for_model(self.related_model)
+        )
 
     @debug_set
     def __set__(self, obj: "ModelInstance", values):  # noqa:D105
@@ -430,26 +470,40 @@ class CustomRelationshipField(ModelField, RelationshipFieldMixin):  # pylint: di
         """
 
         def setter():
+            # The object side of every association is the same, so only
+            # look up its id and content type once.
+            obj_id = obj.design_instance.id
+            obj_type_id = ContentType.objects.get_for_model(obj.design_instance).id
             for value in values:
                 value = self._get_instance(obj, value)
                 if value.design_metadata.created:
                     value.save()
 
-                source = obj.design_instance
-                destination = value.design_instance
-                if self.relationship.source_type == ContentType.objects.get_for_model(destination):
-                    source, destination = destination, source
+                value_id = value.design_instance.id
+                value_type_id = ContentType.objects.get_for_model(value.design_instance).id
+                if self.value_is_source:
+                    source_id, source_type_id, destination_id, destination_type_id = (
+                        value_id,
+                        value_type_id,
+                        obj_id,
+                        obj_type_id,
+                    )
+                else:
+                    source_id, source_type_id, destination_id, destination_type_id = (
+                        obj_id,
+                        obj_type_id,
+                        value_id,
+                        value_type_id,
+                    )
 
-                source_type = ContentType.objects.get_for_model(source)
-                destination_type = ContentType.objects.get_for_model(destination)
                 relationship_association = obj.design_metadata.create_child(
                     RelationshipAssociation,
                     attributes={
                         "relationship_id": self.relationship.id,
-                        "source_id": source.id,
-                        "source_type_id": source_type.id,
-                        "destination_id": destination.id,
-                        "destination_type_id": destination_type.id,
+                        "source_id": source_id,
+                        "source_type_id": source_type_id,
+                        "destination_id": destination_id,
+                        "destination_type_id": destination_type_id,
                     },
                 )
                 relationship_association.save()
@@ -457,30 +511,43 @@ class CustomRelationshipField(ModelField, RelationshipFieldMixin):  # pylint: di
         obj.connect("POST_INSTANCE_SAVE", setter)
 
 
+# Ordered so that the first matching entry wins, in the same way as an
+# isinstance() chain would.
+_FIELD_TYPES = (
+    (ct_fields.GenericRelation, GenericRelationField),
+    (ct_fields.GenericRel, GenericRelField),
+    (ct_fields.GenericForeignKey, GenericForeignKeyField),
+    (TaggableManager, TagField),
+    (django_models.ForeignKey, ForeignKeyField),
+    (django_models.ManyToOneRel, ManyToOneRelField),
+    (django_models.ManyToManyField, ManyToManyField),
+    (django_models.ManyToManyRel, ManyToManyRelField),
+)
+
+# Cache of django field type to design builder field class.
+_FIELD_CLASSES: Dict[type, Type[BaseModelField]] = {}
+
+
+def _relationship_field_class(django_field) -> "Type[BaseModelField] | None":
+    field_type = type(django_field)
+    field_class = _FIELD_CLASSES.get(field_type)
+    if field_class is None:
+        for base_type, base_field_class in _FIELD_TYPES:
+            if isinstance(django_field, base_type):
+                field_class = _FIELD_CLASSES[field_type] = base_field_class
+                break
+    return field_class
+
+
 def field_factory(arg1, arg2) -> ModelField:
     """Factory function to create a ModelField."""
     if isinstance(arg2, Relationship):
         return CustomRelationshipField(arg1, arg2)
 
-    field = None
     if not arg2.is_relation:
-        field = SimpleField(arg2)
-    elif isinstance(arg2, ct_fields.GenericRelation):
-        field = GenericRelationField(arg2)
-    elif isinstance(arg2, ct_fields.GenericRel):
-        field = GenericRelField(arg2)
-    elif isinstance(arg2, ct_fields.GenericForeignKey):
-        field = GenericForeignKeyField(arg2)
-    elif isinstance(arg2, TaggableManager):
-        field = TagField(arg2)
-    elif isinstance(arg2, django_models.ForeignKey):
-        field = ForeignKeyField(arg2)
-    elif isinstance(arg2, django_models.ManyToOneRel):
-        field = ManyToOneRelField(arg2)
-    elif isinstance(arg2, django_models.ManyToManyField):
-        field = ManyToManyField(arg2)
-    elif isinstance(arg2, django_models.ManyToManyRel):
-        field = ManyToManyRelField(arg2)
-    else:
+        return SimpleField(arg2)
+
+    field_class = _relationship_field_class(arg2)
+    if field_class is None:
         raise DesignImplementationError(f"Cannot manufacture field for {type(arg2)}, {arg2} {arg2.is_relation}")
-    return field
+    return field_class(arg2)
@@ -1,22 +1,117 @@
 """Jinja2 related filters and environment methods."""
 
+import os
+import stat
+import tempfile
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from logging import getLogger
+
+from django.conf import settings
 from django.template import engines
 
-from jinja2 import Environment, FileSystemLoader, StrictUndefined
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, StrictUndefined
 from jinja2.environment import Context as JinjaContext
 from jinja2.nativetypes import NativeEnvironment
 from jinja2.utils import missing
 
+LOGGER = getLogger(__name__)
 
-def new_template_environment(root_context, base_dir=None, native_environment=False) -> NativeEnvironment:
+_active_root_context = ContextVar("active_root_context", default=None)
+
+# Jinja's bucket keys only include the template name and a checksum of the
+# template source, so the cache directory must not be shared with other
+# Jinja users (such as Nautobot itself). Like Jinja's own default, the
+# directory is specific to the user running the process.
+DEFAULT_BYTECODE_CACHE_DIR = os.path.join(tempfile.gettempdir(), f"nautobot_design_builder_jinja-{os.getuid()}")
+
+
+@contextmanager
+def root_context_for_render(root_context):
+    """Activate `root_context` for environments that were created without one.
+
+    Template environments are expensive to build and templates are expensive
+    to compile, so an environment created with `root_context=None` can be
+    reused across many renders. Any render performed within this context
+    manager will resolve missing identifiers from `root_context`.
+
+    Args:
+        root_context (design_builder.context.Context): Context object to use when resolving missing identifiers in the rendering process
+    """
+    token = _active_root_context.set(root_context)
+    try:
+        yield
+    finally:
+        _active_root_context.reset(token)
+
+
+@lru_cache(maxsize=None)
+def _bytecode_cache(directory) -> "FileSystemBytecodeCache | None":
+    try:
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        # Cached templates are unmarshalled and executed, so refuse any
+        # directory that someone else could have placed files in. These are
+        # the same checks Jinja makes for its default cache directory.
+        dir_stat = os.lstat(directory)
+        if (
+            not stat.S_ISDIR(dir_stat.st_mode)
+            or dir_stat.st_uid != os.getuid()
+            or stat.S_IMODE(dir_stat.st_mode) & (stat.S_IRWXG | stat.S_IRWXO)
+        ):
+            LOGGER.warning(
+                "Template bytecode cache directory %s must be a directory (not a symlink) owned by the current "
+                "user and not accessible by other users, caching is disabled",
+                directory,
+            )
+            return None
+        # Make sure cached templates can actually be written, otherwise
+        # every template load would fail rather than just the cache.
+        with tempfile.TemporaryFile(dir=directory):
+            pass
+    except OSError as ex:
+        LOGGER.warning("Template bytecode cache directory %s is not usable, caching is disabled: %s", directory, ex)
+        return None
+    return FileSystemBytecodeCache(directory=directory)
+
+
+def template_bytecode_cache() -> "FileSystemBytecodeCache | None":
+    """Get the bytecode cache to use for design templates.
+
+    The bytecode cache stores compiled templates on disk so that the parse
+    and compile step can be skipped in other worker processes. The cache is
+    enabled by the `template_bytecode_cache` app setting and is stored in the
+    `template_bytecode_cache_dir` directory. If no directory is configured
+    then `DEFAULT_BYTECODE_CACHE_DIR` (a per-user directory in the system temp
+    directory) is used. The directory is created if it does not exist. If the
+    directory is not owned by the current user, is a symlink, can be accessed
+    by other users, or cannot be created or written to, then a warning is
+    logged and templates are not cached on disk.
+
+    Returns:
+        FileSystemBytecodeCache: The bytecode cache or `None` if the cache is disabled or unusable.
+    """
+    app_settings = settings.PLUGINS_CONFIG["nautobot_design_builder"]
+    if not app_settings["template_bytecode_cache"]:
+        return None
+    return _bytecode_cache(app_settings["template_bytecode_cache_dir"] or DEFAULT_BYTECODE_CACHE_DIR)
+
+
+def new_template_environment(
+    root_context=None, base_dir=None, native_environment=False, bytecode_cache=None
+) -> NativeEnvironment:
     """Create a new template environment that will resolve identifiers using the supplied root_context.
 
     If base_dir is supplied, templates will be matched from the base directory provided.
 
+    If root_context is `None` then identifiers are resolved from the context activated
+    by `root_context_for_render` at the time the template is rendered.
+
     Args:
         root_context (design_builder.context.Context): Context object to use when resolving missing identifiers in the rendering process
         base_dir (str): Path, or list of paths, to use as search paths for finding templates.
         native_environment (bool): To use native JinjaEnvironment
+        bytecode_cache (jinja2.BytecodeCache): Optional cache for compiled templates.
 
     Returns:
         NativeEnvironment: Jinja native environment
@@ -36,10 +131,15 @@ def new_template_environment(root_context, base_dir=None, native_environment=Fal
             """
             value = super().resolve_or_missing(key)
             if value is missing:
-                if hasattr(root_context, key) or key in root_context:
-                    value = root_context[key]
+                context = root_context
+                if context is None:
+                    context = _active_root_context.get()
+                if context is None:
+                    return value
+                if hasattr(context, key) or key in context:
+                    value = context[key]
                 elif key == "context":
-                    value = root_context
+                    value = context
             return value
 
     def context_class(*args, **kwargs):
@@ -59,6 +159,7 @@ def new_template_environment(root_context, base_dir=None, native_environment=Fal
         trim_blocks=True,
         lstrip_blocks=True,
         undefined=StrictUndefined,
+        bytecode_cache=bytecode_cache,
     )
     for name, func in engines["jinja"].env.filters.items():
         # Register standard Nautobot filters in the environment
@@ -44,10 +44,10 @@ class DesignTestCase(TestCase):
         )
         job.saved_files = {}
 
-        def save_design_file(filename, content):
-            job.saved_files[filename] = content
+        def save_design_files(files):
+            job.saved_files.update(files)
 
-        job.save_design_file = save_design_file
+        job.save_design_files = save_design_files
         self.logged_messages = []
 
         class _CaptureLogHandler(logging.Handler):
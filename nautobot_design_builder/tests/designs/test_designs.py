@@ -39,6 +39,15 @@ class SimpleDesignWithPostImplementation(DesignJob):
         setattr(self, "post_implementation_called", True)
 
 
+class SimpleDesignWithoutSavedDesigns(DesignJob):
+    """Simple design job that doesn't save the rendered design."""
+
+    class Meta:  # pylint: disable=too-few-public-methods
+        name = "Simple Design Without Saved Designs"
+        design_file = "templates/simple_design.yaml.j2"
+        save_designs = False
+
+
 class SimpleDesign3(DesignJob):
     """Simple design job with extra manufacturer."""
 
@@ -120,6 +129,14 @@ class DesignWithValidationError(DesignJob):
         design_file = "templates/design_with_validation_error.yaml.j2"
 
 
+class DesignWithYamlError(DesignJob):
+    """Design job that renders invalid YAML."""
+
+    class Meta:  # pylint: disable=too-few-public-methods
+        name = "Design with YAML errors"
+        design_file = "templates/design_with_yaml_error.yaml.j2"
+
+
 class SimpleDesignDeploymentMode(DesignJob):
     """Simple design job in deployment mode."""
 
@@ -220,6 +237,7 @@ name = "Test Designs"  # pylint:disable=invalid-name
 
 register_jobs(
     SimpleDesign,
+    SimpleDesignWithoutSavedDesigns,
     SimpleDesign3,
     SimpleDesignReport,
     MultiDesignJob,
@@ -228,6 +246,7 @@ register_jobs(
     DesignJobWithExtensions,
     DesignWithRefError,
     DesignWithValidationError,
+    DesignWithYamlError,
     IntegrationDesign,
     SimpleDesignDeploymentMode,
     SimpleDesignDeploymentModeMultipleObjects,
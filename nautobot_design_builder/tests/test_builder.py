@@ -5,10 +5,13 @@ import os
 from unittest.mock import patch
 import yaml
 
+from django.contrib.contenttypes.models import ContentType
 from django.db.models import Manager, Q
 from django.test import TestCase
 
-from nautobot.dcim.models import Cable
+from nautobot.dcim.models import Cable, Device
+from nautobot.extras.models import Relationship
+from nautobot.ipam.models import VLAN
 
 from nautobot_design_builder.design import Environment
 
@@ -223,3 +226,28 @@ class TestGeneralDesigns(BuilderTestCase):
     """Designs that should work with all versions of Nautobot."""
 
     data_dir = os.path.join(os.path.dirname(__file__), "testdata")
+
+
+class TestCustomRelationshipsVersion(TestCase):
+    """Test that custom relationship fields are reloaded when relationships change."""
+
+    def test_relationship_changed_outside_design(self):
+        environment = Environment()
+        device_class = environment.model_class_index[Device]
+        version = environment.custom_relationships_version
+
+        relationship = Relationship.objects.create(
+            label="Device to VLANS",
+            key="device_to_vlans",
+            type="many-to-many",
+            source_type=ContentType.objects.get_for_model(Device),
+            destination_type=ContentType.objects.get_for_model(VLAN),
+        )
+        self.assertEqual(version + 1, environment.custom_relationships_version)
+        # The relationship was created without the design, but the
+        # custom relationship field is still added to the model class.
+        device_class(environment, attributes={})
+        self.assertIn("device_to_vlans", device_class.__dict__)
+
+        relationship.delete()
+        self.assertEqual(version + 2, environment.custom_relationships_version)
@@ -1,15 +1,20 @@
 """Test running design jobs."""
 
 import copy
+import tempfile
+from os import path
 from unittest.mock import patch, Mock, ANY, MagicMock
+import yaml
 
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ValidationError
+from jinja2 import FileSystemBytecodeCache
 
 from nautobot.dcim.models import Location, LocationType, Manufacturer, DeviceType, Device
 from nautobot.ipam.models import VRF, Prefix, IPAddress
 
-from nautobot.extras.models import Status, Role
+from nautobot.extras.models import FileProxy, Status, Role
+from nautobot_design_builder.design_job import DesignJob, _TemplateStream
 from nautobot_design_builder.models import Deployment, ChangeRecord
 from nautobot_design_builder.errors import DesignImplementationError, DesignValidationError
 from nautobot_design_builder.tests import DesignTestCase
@@ -39,6 +44,62 @@ class TestDesignJob(DesignTestCase):
         )
         environment.return_value.roll_back.assert_not_called()
 
+    def test_template_environment_is_cached(self):
+        env = test_designs.SimpleDesign.template_environment()
+        self.assertIs(env, test_designs.SimpleDesign.template_environment())
+        self.assertIsNot(env, test_designs.SimpleDesign3.template_environment())
+
+    def test_template_environment_stored_on_class(self):
+        env = test_designs.SimpleDesign.template_environment()
+        self.assertIs(env, test_designs.SimpleDesign.__dict__["_template_environment"])
+
+        # A class redefined by a module reload gets its own environment
+        # rather than sharing (or leaking) the one built for the old class.
+        class SimpleDesign(test_designs.SimpleDesign):  # pylint: disable=missing-class-docstring
+            Meta = test_designs.SimpleDesign.Meta
+
+        self.assertIsNot(env, SimpleDesign.template_environment())
+
+    def test_compile_templates_uses_class_environment(self):
+        class SimpleDesign(test_designs.SimpleDesign):  # pylint: disable=missing-class-docstring
+            Meta = test_designs.SimpleDesign.Meta
+
+        env = SimpleDesign.__dict__["_template_environment"]
+        with patch.object(env.loader, "get_source", side_effect=AssertionError("template was not precompiled")):
+            env.get_template(SimpleDesign.Meta.design_file)
+
+    def test_class_definition_with_unwritable_bytecode_cache(self):
+        with tempfile.NamedTemporaryFile() as file:
+            # Nothing can be read from or written below a regular file.
+            cache = FileSystemBytecodeCache(directory=path.join(file.name, "cache"))
+            with patch("nautobot_design_builder.design_job.template_bytecode_cache", return_value=cache):
+
+                class SimpleDesign(test_designs.SimpleDesign):  # pylint: disable=missing-class-docstring
+                    Meta = test_designs.SimpleDesign.Meta
+
+        self.assertIn("_template_environment", SimpleDesign.__dict__)
+
+    def test_implement_design_override_is_deprecated(self):
+        with self.assertWarns(DeprecationWarning):
+
+            class SimpleDesign(test_designs.SimpleDesign):  # pylint: disable=missing-class-docstring,unused-variable
+                Meta = test_designs.SimpleDesign.Meta
+
+                def implement_design(self, context, design_file, commit):
+                    pass
+
+    def test_templates_compiled_on_class_definition(self):
+        env = test_designs.SimpleDesignReport.template_environment()
+        meta = test_designs.SimpleDesignReport.Meta
+        with patch.object(env.loader, "get_source", side_effect=AssertionError("template was not precompiled")):
+            env.get_template(meta.design_file)
+            env.get_template(meta.report)
+
+    def test_template_search_paths(self):
+        search_paths = test_designs.SimpleDesign.template_search_paths()
+        self.assertEqual((path.dirname(test_designs.__file__),), search_paths)
+        self.assertIs(search_paths, test_designs.SimpleDesign.template_search_paths())
+
     def test_simple_design_rollback(self):
         job1 = self.get_mocked_job(test_designs.SimpleDesign)
         job1.run(data={}, dryrun=False)
@@ -47,6 +108,13 @@ class TestDesignJob(DesignTestCase):
         self.assertRaises(DesignValidationError, job2.run, data={}, dryrun=False)
         self.assertEqual(2, Manufacturer.objects.all().count())
 
+    def test_simple_design_without_saved_designs(self):
+        job = self.get_mocked_job(test_designs.SimpleDesignWithoutSavedDesigns)
+        job.run(data={}, dryrun=False)
+        self.assertEqual(2, Manufacturer.objects.all().count())
+        self.assertEqual({}, job.designs)
+        self.assertEqual({}, job.saved_files)  # pylint:disable=no-member
+
     def test_simple_design_with_post_implementation(self):
         job = self.get_mocked_job(test_designs.SimpleDesignWithPostImplementation)
         job.run(dryrun=False, **self.data)
@@ -66,6 +134,28 @@ class TestDesignJob(DesignTestCase):
         self.assertIn("simple_report.md", job.saved_files)  # pylint:disable=no-member
         self.assertEqual("Report output", job.saved_files["simple_report.md"])  # pylint:disable=no-member
 
+    def test_template_stream_read(self):
+        chunks = ["a: 1\n", "b: " + "x" * 10000 + "\n", "", "c: 3\n"]
+        stream = _TemplateStream(iter(chunks), "design.yaml.j2")
+        parts = []
+        while True:
+            part = stream.read(4096)
+            if not part:
+                break
+            self.assertLessEqual(len(part), 4096)
+            parts.append(part)
+        self.assertEqual("".join(chunks), "".join(parts))
+        self.assertEqual("", stream.read())
+
+    def test_save_design_files(self):
+        job = self.get_mocked_job(test_designs.SimpleDesign)
+        # get_mocked_job replaces save_design_files, so call the real one.
+        DesignJob.save_design_files(job, {"design.yaml": "manufacturers: []\n", "report.md": b"Report output"})
+        files = {proxy.name: proxy for proxy in FileProxy.objects.filter(job_result=job.job_result)}
+        self.assertEqual({"design.yaml", "report.md"}, set(files))
+        self.assertEqual(b"manufacturers: []\n", files["design.yaml"].file.read())
+        self.assertEqual(b"Report output", files["report.md"].file.read())
+
     def test_multiple_design_files(self):
         job = self.get_mocked_job(test_designs.MultiDesignJob)
         job.run(dryrun=False, **self.data)
@@ -99,6 +189,7 @@ class TestDesignJob(DesignTestCase):
             extensions=test_designs.DesignJobWithExtensions.Meta.extensions,
             change_set=ANY,
             import_mode=False,
+            track_changes=False,
         )
 
     def test_import_design_create_or_update(self):
@@ -202,6 +293,14 @@ class TestDesignJobLogging(DesignTestCase):
 
         self.assertEqual(str(want_error), str(raised.exception))
 
+    def test_yaml_error_saves_rendered_design(self):
+        job = self.get_mocked_job(test_designs.DesignWithYamlError)
+        self.assertRaises(yaml.YAMLError, job.run, dryrun=False, **self.data)
+        self.assertEqual(
+            "---\nmanufacturers:\n  - name: [Test Manufacturer",
+            job.saved_files["design_with_yaml_error.yaml"],  # pylint:disable=no-member
+        )
+
 
 class TestDesignJobIntegration(DesignTestCase):
     """Test to validate the whole end to end create and update design life cycle."""
@@ -1,11 +1,18 @@
 """Unit tests related to template extensions."""
 
+import os
 import sys
+from collections import OrderedDict
+from os import path
+from unittest.mock import MagicMock
+import yaml
+
 from django.test import TestCase
 
 from nautobot_design_builder import ext
 from nautobot_design_builder.design import Environment
 from nautobot_design_builder.ext import DesignImplementationError
+from nautobot_design_builder.tests import DesignTestCase
 
 
 class Extension(ext.AttributeExtension):
@@ -124,3 +131,62 @@ class TestExtensionCommitRollback(TestCase):
         committed, rolled_back = self.run_test(design, commit=False)
         self.assertTrue(rolled_back)
         self.assertFalse(committed)
+
+
+class TestGitContextExtension(DesignTestCase):
+    """Test the git_context attribute extension."""
+
+    def setUp(self):
+        super().setUp()
+        self.extension = ext.GitContextExtension(MagicMock())
+
+    def test_missing_fields(self):
+        with self.assertRaises(DesignImplementationError) as raised:
+            self.extension.attribute(value={"data": {}})
+        self.assertEqual("git-context is missing destination", str(raised.exception))
+
+    def test_roll_back(self):
+        value = {"destination": "devices/device1.yml", "data": {"key": "value"}}
+        self.extension.attribute(value=value)
+        self.extension.attribute(value=value)
+        self.assert_context_files_created("devices/device1.yml")
+
+        self.extension.roll_back()
+        self.assertFalse(path.exists(path.join(self.git_path, "devices")))
+
+    def test_roll_back_nested_directories(self):
+        self.extension.attribute(value={"destination": "sites/site1/device1.yml", "data": {}})
+        self.assert_context_files_created("sites/site1/device1.yml")
+
+        self.extension.roll_back()
+        self.assertFalse(path.exists(path.join(self.git_path, "sites")))
+
+    def test_roll_back_existing_directory(self):
+        existing_file = path.join(self.git_path, "devices", "existing.yml")
+        os.makedirs(path.dirname(existing_file))
+        with open(existing_file, "w", encoding="utf-8") as file:
+            file.write("key: value\n")
+
+        self.extension.attribute(value={"destination": "devices/device1.yml", "data": {}})
+        self.extension.roll_back()
+        self.assertFalse(path.exists(path.join(self.git_path, "devices", "device1.yml")))
+        self.assertTrue(path.exists(existing_file))
+
+    def test_context_file_contents(self):
+        data = {"bgp_asn": 64495, "neighbors": ["192.0.2.1", "192.0.2.2"], "description": "Zürich"}
+        self.extension.attribute(value={"destination": "devices/device1.yml", "data": data})
+        with open(path.join(self.git_path, "devices", "device1.yml"), encoding="utf-8") as file:
+            content = file.read()
+        self.assertEqual(data, yaml.safe_load(content))
+        # Non-ASCII characters are escaped, as they always have been.
+        self.assertIn('description: "Z\\xFCrich"', content)
+
+    def test_context_file_python_types(self):
+        data = {"neighbors": ("192.0.2.1", "192.0.2.2"), "ordered": OrderedDict(key="value")}
+        self.extension.attribute(value={"destination": "devices/device1.yml", "data": data})
+        with open(path.join(self.git_path, "devices", "device1.yml"), encoding="utf-8") as file:
+            self.assertEqual(data, yaml.unsafe_load(file))
+
+    def test_commit_without_changes(self):
+        self.extension.commit()
+        self.git_mock.assert_not_called()
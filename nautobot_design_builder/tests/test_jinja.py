@@ -1,9 +1,20 @@
 """Unit tests related to jinja2 rendering in the Design Builder."""
 
+import os
+import tempfile
 import unittest
+from unittest.mock import patch
+
+from django.conf import settings
 
 from nautobot_design_builder.context import Context
-from nautobot_design_builder.jinja2 import new_template_environment
+from nautobot_design_builder.jinja2 import (
+    DEFAULT_BYTECODE_CACHE_DIR,
+    _bytecode_cache,
+    new_template_environment,
+    root_context_for_render,
+    template_bytecode_cache,
+)
 
 
 class TestJinja(unittest.TestCase):
@@ -17,6 +28,14 @@ class TestJinja(unittest.TestCase):
         got = env.from_string(r"{{ var1 }}").render()
         self.assertEqual(want, got)
 
+    def test_render_with_active_root_context(self):
+        env = new_template_environment()
+        template = env.from_string(r"{{ var1 }}")
+        for want in ["val1", "val2"]:
+            with root_context_for_render(Context.load({"var1": want})):
+                got = template.render()
+            self.assertEqual(want, got)
+
     def test_context_with_property(self):
         class TestContext(Context):  # pylint:disable=missing-class-docstring
             @property
@@ -106,3 +125,55 @@ tenant__slug: small-sites
                 template = env.from_string(test_case["template"])
                 got = template.render()
                 self.assertEqual(test_case["want"], got)
+
+
+class TestTemplateBytecodeCache(unittest.TestCase):
+    """Test selecting the bytecode cache for design templates."""
+
+    def setUp(self):
+        _bytecode_cache.cache_clear()
+        self.addCleanup(_bytecode_cache.cache_clear)
+
+    def _settings(self, **kwargs):
+        return patch.dict(settings.PLUGINS_CONFIG["nautobot_design_builder"], kwargs)
+
+    def test_default_directory(self):
+        with self._settings(template_bytecode_cache=True, template_bytecode_cache_dir=None):
+            cache = template_bytecode_cache()
+        self.assertEqual(DEFAULT_BYTECODE_CACHE_DIR, cache.directory)
+
+    def test_disabled(self):
+        with self._settings(template_bytecode_cache=False):
+            self.assertIsNone(template_bytecode_cache())
+
+    def test_directory_accessible_by_others(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(os.rmdir, directory)
+        os.chmod(directory, 0o777)
+        with self._settings(template_bytecode_cache=True, template_bytecode_cache_dir=directory):
+            with self.assertLogs("nautobot_design_builder.jinja2", level="WARNING"):
+                self.assertIsNone(template_bytecode_cache())
+
+    def test_symlinked_directory(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(os.rmdir, directory)
+        link = f"{directory}-link"
+        os.symlink(directory, link)
+        self.addCleanup(os.remove, link)
+        with self._settings(template_bytecode_cache=True, template_bytecode_cache_dir=link):
+            with self.assertLogs("nautobot_design_builder.jinja2", level="WARNING"):
+                self.assertIsNone(template_bytecode_cache())
+
+    def test_private_directory(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(os.rmdir, directory)
+        with self._settings(template_bytecode_cache=True, template_bytecode_cache_dir=directory):
+            self.assertEqual(directory, template_bytecode_cache().directory)
+
+    def test_unusable_directory(self):
+        with tempfile.NamedTemporaryFile() as file:
+            # A directory can't be created below a regular file.
+            directory = os.path.join(file.name, "cache")
+            with self._settings(template_bytecode_cache=True, template_bytecode_cache_dir=directory):
+                with self.assertLogs("nautobot_design_builder.jinja2", level="WARNING"):
+                    self.assertIsNone(template_bytecode_cache())
@@ -15,6 +15,11 @@ from packaging.version import Version
 from packaging.specifiers import Specifier
 import yaml
 
+try:
+    from yaml import CDumper as Dumper, CSafeDumper as SafeDumper, CSafeLoader as SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import Dumper, SafeDumper, SafeLoader
+
 from django.conf import settings
 
 import nautobot
@@ -51,7 +56,7 @@ def load_design_yaml(cls, resource) -> "List | Dict":
     Returns:
         list or dict: list or dictionary containing data from YAML design files
     """
-    return yaml.safe_load(load_design_file(cls, resource))
+    return yaml.load(load_design_file(cls, resource), Loader=SafeLoader)
 
 
 def load_design_file(cls, resource) -> str: